@@ -1,3 +1,4 @@
+import gc
 import math
 import time
 
@@ -10,55 +11,106 @@ micropython.mem_info()
 
 
 class ColorF:
+    """
+    A color configured with floating point channels in [0.0, 1.0], but stored as
+    an (r, g, b) tuple of integers in [0, 255], which is what animations work with.
+    """
     def __init__(self, r, g, b):
-        self.r = min(r, 1.0)
-        self.g = min(g, 1.0)
-        self.b = min(b, 1.0)
+        self.rgb = (
+            int(255.0 * max(min(r, 1.0), 0.0)),
+            int(255.0 * max(min(g, 1.0), 0.0)),
+            int(255.0 * max(min(b, 1.0), 0.0)),
+        )
+
+    @classmethod
+    def from_rgb(cls, rgb):
+        """
+        Wraps an integer (r, g, b) tuple without going through the float constructor.
+        """
+        color = object.__new__(cls)
+        color.rgb = rgb
+        return color
+
+    @property
+    def r(self):
+        return self.rgb[0] / 255.0
+
+    @property
+    def g(self):
+        return self.rgb[1] / 255.0
+
+    @property
+    def b(self):
+        return self.rgb[2] / 255.0
         
     def scale_brightness(self, brightness):
-        return ColorF(
-            self.r * brightness,
-            self.g * brightness,
-            self.b * brightness,
-        )
+        return ColorF.from_rgb(scale_rgb(self.rgb, int(256.0 * max(min(brightness, 1.0), 0.0))))
     
     @property
     def out(self):
-        return (
-            int(255.0 * self.r),
-            int(255.0 * self.g),
-            int(255.0 * self.b),
-        )
+        return self.rgb
     
     @property
     def is_black(self):
-        return self.r <= 0 and self.g <= 0 and self.b <= 0
+        return self.rgb == (0, 0, 0)
     
     @classmethod
     def mix(cls, *colors):
-        r = 0.0
-        g = 0.0
-        b = 0.0
+        r = 0
+        g = 0
+        b = 0
         for c in colors:
-            r += c.r
-            g += c.g
-            b += c.b
-        n = float(len(colors))
-        return ColorF(
-            r,
-            g,
-            b,
-        )
+            cr, cg, cb = c.rgb
+            r += cr
+            g += cg
+            b += cb
+        n = len(colors)
+        if n == 0:
+            return ColorF.from_rgb((0, 0, 0))
+        return ColorF.from_rgb((r // n, g // n, b // n))
     
     def __str__(self):
         return f"r={self.r},g={self.g},b={self.b}"
 
 
+def scale_rgb(rgb, brightness):
+    """
+    Scales an integer (r, g, b) color by an integer brightness in [0, 256].
+    """
+    r, g, b = rgb
+    return ((r * brightness) >> 8, (g * brightness) >> 8, (b * brightness) >> 8)
+
+
+def rgb_lut(rgb, brightnesses):
+    """
+    Builds a table of 256 (r, g, b) triples, one per phase, each being rgb
+    scaled by the brightness for that phase.
+    """
+    lut = bytearray(256 * 3)
+    i = 0
+    for brightness in brightnesses:
+        lut[i:i + 3] = bytes(scale_rgb(rgb, brightness))
+        i += 3
+    return lut
+
+
+@micropython.native
+def rgb_lut_lookup(lut, phase):
+    """
+    Returns the (r, g, b) triple for a phase (wrapped into one loop) from a
+    table built by rgb_lut.
+    """
+    i = (phase & 0xFF) * 3
+    return (lut[i], lut[i + 1], lut[i + 2])
+
+
 class NeoPixelBlock:
     def __init__(self, np, start, end):
         self.np = np
         self.start = start
         self.end = end
+        # View onto the underlying NeoPixel buffer for direct byte-level writes.
+        self.buf = memoryview(np.buf)[start * 3:end * 3]
 
     @property
     def n(self):
@@ -78,14 +130,47 @@ class NeoPixelBlock:
         for i in range(self.start, self.end):
             self.np[i] = color
 
+    def write_pixel(self, index, r, g, b):
+        """
+        Sets a pixel by writing straight into the NeoPixel buffer (in GRB order),
+        skipping the bounds checks and dispatch of __setitem__.
+        """
+        buf = self.buf
+        o = index * 3
+        buf[o] = g
+        buf[o + 1] = r
+        buf[o + 2] = b
+
+    def sync(self):
+        pass
+
     def write(self):
         self.np.write()
 
 
 class NeoPixelReplicate:
+    """
+    Mirrors writes to several NeoPixel-like instances.
+
+    In the common case where every member is an equally sized NeoPixelBlock of
+    the same NeoPixel, `write_pixel` (the renderers' fast path) and direct writes
+    to `buf` only touch the first block, and `sync()` copies its bytes over the
+    others in one go. Anything rendering that way must call `sync()` once it has
+    finished writing a frame. `__setitem__` and `fill` always write every member.
+    Otherwise (e.g. for raw NeoPixel members) `write_pixel` falls back to
+    `__setitem__` on each member, and `sync()` does nothing.
+    """
     def __init__(self, *nps):
         self.nps = nps
         self.n = min(np.n for np in nps)
+        first = nps[0]
+        self.mirror = all(
+            isinstance(np, NeoPixelBlock) and np.np is first.np and np.n == first.n
+            for np in nps
+        )
+        if self.mirror:
+            self.buf = first.buf
+            self._mirrors = nps[1:]
 
     def __getitem__(self, index):
         if index < 0 or index >= self.n:
@@ -102,124 +187,310 @@ class NeoPixelReplicate:
         for np in self.nps:
             np.fill(color)
 
+    def write_pixel(self, index, r, g, b):
+        if self.mirror:
+            self.nps[0].write_pixel(index, r, g, b)
+            return
+        for np in self.nps:
+            np[index] = (r, g, b)
+
+    def sync(self):
+        if self.mirror:
+            buf = self.buf
+            for np in self._mirrors:
+                np.buf[:] = buf
+
     def write(self):
+        if self.mirror:
+            # All members share one NeoPixel, so a single write covers them all.
+            self.sync()
+            self.nps[0].write()
+            return
         for np in self.nps:
             np.write()
 
+# Animations work in integer "phases" rather than (software-emulated) floats:
+# one loop of an animation is divided into 256 steps, and both t and n are given
+# in those steps, so e.g. `t & 0xFF` wraps t into a single loop. Each loop lasts
+# PERIOD_MS milliseconds of Timeline time.
+PERIOD_MS = 1000
+
+
+def to_phase(t_ms):
+    """
+    Converts a Timeline time in milliseconds to a phase in [0, 256).
+    """
+    return ((t_ms % PERIOD_MS) << 8) // PERIOD_MS
+
+
 class Animation:
     def evaluate(self, t, n):
         raise NotImplementedError("Subclasses must implement evaluate method")
 
+    def compile(self):
+        """
+        Returns a function f(t, n) equivalent to self.evaluate.
+
+        Combinators override this to fold themselves and their (compiled) base
+        animations into a single closure, so rendering doesn't pay for a method
+        call and attribute lookups at every level of the animation tree.
+        """
+        return self.evaluate
+
 
 class Timeline:
     def __init__(self):
         self.t0 = time.ticks_ms()
 
     @property
+    @micropython.native
     def t(self):
-        return float(max(time.ticks_diff(time.ticks_ms(), self.t0), 0)) / 1000.0
+        """
+        Milliseconds since the timeline started.
+        """
+        return max(time.ticks_diff(time.ticks_ms(), self.t0), 0)
 
 
 class BaseRenderer:
     def render(self, t):
+        """
+        Renders the frame at time t (in milliseconds). Returns whether any pixels
+        may have changed.
+        """
         raise NotImplementedError("Subclasses must implement render method")
 
 
+@micropython.viper
+def _blit(dst: ptr8, cache: ptr8, t_idx: int, n: int, n_steps: int):
+    """
+    Copies frame `t_idx` of a baked cache (n_steps samples per frame) into `dst`,
+    mapping each of the n pixels in `dst` onto its nearest sample.
+    """
+    row = t_idx * n_steps
+    for i in range(n):
+        s = (row + i * n_steps // n) * 3
+        o = i * 3
+        dst[o] = cache[s]
+        dst[o + 1] = cache[s + 1]
+        dst[o + 2] = cache[s + 2]
+
+
 class Renderer(BaseRenderer):
+    """
+    Evaluates an animation for every pixel on every frame. Each evaluation returns
+    a new (r, g, b) tuple, so this allocates per pixel; animations that are a
+    function of phase alone are better baked and drawn with a BakedFrameRenderer.
+    """
     def __init__(self, np, animation):
         self.np = np
         self.animation = animation
+        self.evaluate = animation.compile()
+        # Each pixel's position along the strip, as a phase.
+        self.positions = bytes((n << 8) // np.n for n in range(np.n))
 
+    @micropython.native
     def render(self, t):
-        t = t % 1.0
-        npn = float(self.np.n)
-        colors = [self.animation.evaluate(t, float(n) / npn).out for n in range(self.np.n)]
-        for idx, color in enumerate(colors):
-            self.np[idx] = color
+        t = to_phase(t)
+        # Locals are much cheaper than attribute lookups in MicroPython.
+        # (A direct method call, unlike caching np.write_pixel, doesn't allocate
+        # a bound method.)
+        evaluate = self.evaluate
+        np = self.np
+        n = 0
+        for x in self.positions:
+            r, g, b = evaluate(t, x)
+            np.write_pixel(n, r, g, b)
+            n += 1
+        np.sync()
+        return True
+
+
+class BakedFrameRenderer(BaseRenderer):
+    """
+    Renders a BakedAnimation by copying its cached frames straight into the
+    NeoPixel buffer, without evaluating anything at runtime. `np` must expose a
+    `buf`, i.e. be a NeoPixelBlock or a mirroring NeoPixelReplicate.
+
+    The cache need not have one sample per pixel: pixels are mapped onto the
+    baked samples the same way BakedAnimation.evaluate does, so e.g. n_steps=1
+    fills the whole block with a single color.
+
+    `reverse` plays the baked frames backwards.
+    """
+    def __init__(self, np, baked_animation, reverse=False):
+        self.np = np
+        self.cache = baked_animation.cache
+        self.t_steps = baked_animation.t_steps
+        self.n_steps = baked_animation.n_steps
+        self.reverse = reverse
+        self._last_t_idx = -1
+
+    @micropython.native
+    def render(self, t):
+        t = to_phase(t)
+        if self.reverse:
+            t = -t & 0xFF
+        t_idx = (t * self.t_steps) >> 8
+        if t_idx == self._last_t_idx:
+            return False
+        self._last_t_idx = t_idx
+        _blit(self.np.buf, self.cache, t_idx, self.np.n, self.n_steps)
+        self.np.sync()
+        return True
 
 
 class Renderers(BaseRenderer):
     def __init__(self, *renderers):
         self.renderers = renderers
 
+    @micropython.native
     def render(self, t):
+        changed = False
         for renderer in self.renderers:
-            renderer.render(t)
+            if renderer.render(t):
+                changed = True
+        return changed
 
 
 class AnimationFlash(Animation):
     def __init__(self, color, a=12.0, b=2.0, c=2.0, d=2.0):
         self.color = color
+        self.rgb = color.rgb
         self.a = a
-        self.b = b
+        self.b = int(b)
         self.c = c
-        self.d = d
+        self.d = int(d)
+        # One period of the flash in 256 steps, as pre-scaled (r, g, b) triples.
+        self.lut = rgb_lut(self.rgb, (self._brightness(i / 256.0) for i in range(256)))
 
-    def evaluate(self, t, n):
+    def _brightness(self, x):
         """
-        y = min(1 - (⌊ax⌋ mod b), 1 - (⌊cx⌋ mod d))
+        y = min(1 - (⌊ax⌋ mod b), 1 - (⌊cx⌋ mod d)), as an integer in [0, 256]
         """
-        # print(f"Evaluating at t={t}")
-        # x = t % 1.0
-        x = t
-        # print(f"x={x}")
-        y = min(1.0 - (int(self.a * x) % self.b), 1.0 - (int(self.c * x) % self.d))
-        # print(f"y={y}")
-        return self.color.scale_brightness(y)
+        y = min(256 - ((int(self.a * x) % self.b) << 8), 256 - ((int(self.c * x) % self.d) << 8))
+        return max(y, 0)
+
+    def evaluate(self, t, n):
+        return rgb_lut_lookup(self.lut, t)
     
 
+# x² over [0, 1) in 256 steps, as integer brightnesses.
+SQR_LUT = bytes((i * i) >> 8 for i in range(256))
+
+
 class AnimationSpinner(Animation):
     def __init__(self, color):
         self.color = color
+        self.rgb = color.rgb
+        # One period of the spinner's brightness curve, as pre-scaled (r, g, b) triples.
+        self.lut = rgb_lut(self.rgb, SQR_LUT)
 
     def evaluate(self, t, n):
         # print(f"Evaluating at t={t}, n={n}")
-        color = self.color
-        x = t + n
-        # print(f"x={x}")
-        y = (x % 1.0) ** 2.0
-        # print(f"y={y}")
-        return color.scale_brightness(y)
+        return rgb_lut_lookup(self.lut, t + n)
     
 
 class AnimationRainbow(Animation):
     def __init__(self, brightness=1.0):
         self.brightness = brightness
+        # One period of (cos(x) + 1) / 2 in 256 steps, pre-scaled by brightness.
+        # The green and blue channels read the same table a third and two thirds
+        # of a period on.
+        k = 255.0 * min(brightness, 1.0)
+        self.lut = bytes(int(k * (math.cos(i / 256.0 * 2 * math.pi) + 1.0) / 2.0) for i in range(256))
 
+    @micropython.native
     def evaluate(self, t, n):
         # print(f"Evaluating at t={t}, n={n}")
-        x = (t + n) % 1.0
-        r = (math.cos(x * 2 * math.pi) + 1.0) / 2.0
-        g = (math.cos((x + 1.0/3.0) * 2 * math.pi) + 1.0) / 2.0
-        b = (math.cos((x + 2.0/3.0) * 2 * math.pi) + 1.0) / 2.0
-        # print(f"y={y}")
-        return ColorF(r, g, b).scale_brightness(self.brightness)
+        i = (t + n) & 0xFF
+        lut = self.lut
+        return (lut[i], lut[(i + 85) & 0xFF], lut[(i + 171) & 0xFF])
     
 
 class TimeShiftedAnimation(Animation):
     def __init__(self, base_animation, time_shift):
+        """
+        time_shift is given as a fraction of a loop.
+        """
         self.base_animation = base_animation
-        self.time_shift = time_shift
+        self.time_shift = int(time_shift * 256)
 
+    @micropython.native
     def evaluate(self, t, n):
         return self.base_animation.evaluate(t + self.time_shift, n)
 
+    def compile(self):
+        base = self.base_animation.compile()
+        time_shift = self.time_shift
+
+        @micropython.native
+        def evaluate(t, n):
+            return base(t + time_shift, n)
+        return evaluate
+
 
 class MixedAnimation(Animation):
+    """
+    Averages the colors of several animations (black if there are none).
+    """
     def __init__(self, *animations):
         self.animations = animations
+        self.count = len(animations)
 
+    @micropython.native
     def evaluate(self, t, n):
-        return ColorF.mix(*(anim.evaluate(t, n) for anim in self.animations))
+        r = 0
+        g = 0
+        b = 0
+        for anim in self.animations:
+            pr, pg, pb = anim.evaluate(t, n)
+            r += pr
+            g += pg
+            b += pb
+        k = self.count
+        if k == 0:
+            return (0, 0, 0)
+        return (r // k, g // k, b // k)
+
+    def compile(self):
+        bases = tuple(anim.compile() for anim in self.animations)
+        k = self.count
+        if k == 0:
+            return lambda t, n: (0, 0, 0)
+
+        @micropython.native
+        def evaluate(t, n):
+            r = 0
+            g = 0
+            b = 0
+            for base in bases:
+                pr, pg, pb = base(t, n)
+                r += pr
+                g += pg
+                b += pb
+            return (r // k, g // k, b // k)
+        return evaluate
     
 
 class SpeedAdjustedAnimation(Animation):
     def __init__(self, base_animation, speed):
         self.base_animation = base_animation
         self.speed = speed
+        # Speed as a fixed-point multiplier with 8 fractional bits.
+        self.speed_num = int(speed * 256)
 
+    @micropython.native
     def evaluate(self, t, n):
-        return self.base_animation.evaluate(t * self.speed, n)
+        return self.base_animation.evaluate((t * self.speed_num) >> 8, n)
+
+    def compile(self):
+        base = self.base_animation.compile()
+        speed_num = self.speed_num
+
+        @micropython.native
+        def evaluate(t, n):
+            return base((t * speed_num) >> 8, n)
+        return evaluate
     
 
 class ConcatenatedAnimation(Animation):
@@ -227,24 +498,55 @@ class ConcatenatedAnimation(Animation):
         self.animations = animations
         self.durations = [1.0 for _ in animations]
         self.total_duration = sum(self.durations)
-
-    def evaluate(self, t, n):
-        t = t % self.total_duration
+        # Segment start times, and which animation is playing at each phase over
+        # the total duration, so evaluate doesn't have to search the durations.
+        starts = []
         cumulative = 0.0
-        for anim, dur in zip(self.animations, self.durations):
-            if cumulative + dur >= t:
-                local_t = t - cumulative
-                return anim.evaluate(local_t, n)
+        for dur in self.durations:
+            starts.append(int(cumulative * 256))
             cumulative += dur
-        return ColorF(0.0, 0.0, 0.0)  # Fallback to black if something goes wrong
+        self.starts = tuple(starts)
+        self.total_phases = int(self.total_duration * 256)
+        self.segment_lut = bytearray(self.total_phases)
+        for k, start in enumerate(self.starts):
+            for i in range(start, self.total_phases):
+                self.segment_lut[i] = k
+
+    @micropython.native
+    def evaluate(self, t, n):
+        t = t % self.total_phases
+        k = self.segment_lut[t]
+        return self.animations[k].evaluate(t - self.starts[k], n)
+
+    def compile(self):
+        bases = tuple(anim.compile() for anim in self.animations)
+        starts = self.starts
+        total_phases = self.total_phases
+        segment_lut = self.segment_lut
+
+        @micropython.native
+        def evaluate(t, n):
+            t = t % total_phases
+            k = segment_lut[t]
+            return bases[k](t - starts[k], n)
+        return evaluate
 
 
 class ReverseAnimation(Animation):
     def __init__(self, base_animation):
         self.base_animation = base_animation
 
+    @micropython.native
     def evaluate(self, t, n):
         return self.base_animation.evaluate(-t, n)
+
+    def compile(self):
+        base = self.base_animation.compile()
+
+        @micropython.native
+        def evaluate(t, n):
+            return base(-t, n)
+        return evaluate
     
 
 class RemapAnimation(Animation):
@@ -252,34 +554,81 @@ class RemapAnimation(Animation):
     Takes an animation that takes t in [0,1], and an interval [t0, t1].
     Produces a new animation that at time t = 0 evaluates the base animation at t0,
     at time t = 1 evaluates the base animation at t1, and linearly interpolates in between.
+    (Times here are fractions of a loop; internally they are converted to phases.)
     """
     def __init__(self, base_animation, t0, t1):
         self.base_animation = base_animation
         self.t0 = t0
         self.t1 = t1
+        self.t0_phase = int(t0 * 256)
+        # Length of the interval as a fixed-point multiplier with 8 fractional bits.
+        self.span_num = int((t1 - t0) * 256)
 
+    @micropython.native
     def evaluate(self, t, n):
-        t_mapped = self.t0 + (self.t1 - self.t0) * t
+        t_mapped = self.t0_phase + ((self.span_num * t) >> 8)
         return self.base_animation.evaluate(t_mapped, n)
+
+    def compile(self):
+        base = self.base_animation.compile()
+        t0_phase = self.t0_phase
+        span_num = self.span_num
+
+        @micropython.native
+        def evaluate(t, n):
+            return base(t0_phase + ((span_num * t) >> 8), n)
+        return evaluate
     
 
 class BakedAnimation(Animation):
+    """
+    Pre-evaluates an animation on a t_steps x n_steps grid.
+
+    The cache is a flat bytearray of 3 bytes per sample, frame by frame, stored in
+    NeoPixel GRB byte order so that whole frames can be copied straight into a
+    NeoPixel buffer.
+
+    evaluate wraps t into a single loop, but expects n to already be a phase in
+    [0, 256), as renderers provide.
+    """
     def __init__(self, base_animation, t_steps=100, n_steps=100):
+        # There are only 256 phases, so any further steps could never be looked up.
+        assert 0 < t_steps <= 256 and 0 < n_steps <= 256, "steps must be in [1, 256]"
         self.base_animation = base_animation
         self.t_steps = t_steps
         self.n_steps = n_steps
-        self.cache = [
-            [self.base_animation.evaluate(float(t) / float(t_steps), float(n) / float(n_steps))
-             for n in range(n_steps)]
-            for t in range(t_steps)
-        ]
-
+        self.cache = bytearray(t_steps * n_steps * 3)
+        evaluate = base_animation.compile()
+        i = 0
+        for t in range(t_steps):
+            for n in range(n_steps):
+                r, g, b = evaluate((t << 8) // t_steps, (n << 8) // n_steps)
+                self.cache[i] = g
+                self.cache[i + 1] = r
+                self.cache[i + 2] = b
+                i += 3
+
+    @micropython.native
     def evaluate(self, t, n):
-        t = t % 1.0
-        n = n % 1.0
-        t_index = int(t * float(self.t_steps)) % self.t_steps
-        n_index = int(n * float(self.n_steps)) % self.n_steps
-        return self.cache[t_index][n_index]
+        n_steps = self.n_steps
+        t_index = ((t & 0xFF) * self.t_steps) >> 8
+        n_index = (n * n_steps) >> 8
+        i = (t_index * n_steps + n_index) * 3
+        cache = self.cache
+        return (cache[i + 1], cache[i], cache[i + 2])
+
+    def compile(self):
+        cache = self.cache
+        t_steps = self.t_steps
+        n_steps = self.n_steps
+
+        @micropython.native
+        def evaluate(t, n):
+            t_index = ((t & 0xFF) * t_steps) >> 8
+            n_index = (n * n_steps) >> 8
+            i = (t_index * n_steps + n_index) * 3
+            return (cache[i + 1], cache[i], cache[i + 2])
+        return evaluate
     
 
 # Switch pins
@@ -291,6 +640,7 @@ pin_y = Pin(14, Pin.IN, Pin.PULL_UP)
 # Onboard LED (shows activity)
 led = Pin("LED", Pin.OUT)
 led_on = True
+@micropython.native
 def toggle_led():
     global led_on
     led.value(1 if led_on else 0)
@@ -317,7 +667,9 @@ def make_rainbow_renderer(np):
     np_block1 = NeoPixelBlock(np, 0, n//2)
     np_block2 = NeoPixelBlock(np, n//2, n)
     np_split = NeoPixelReplicate(np_block1, np_block2)
-    rainbow_renderer = Renderer(np_split, rainbow_anim)
+    # One baked frame per phase and one sample per pixel, so baking is lossless.
+    baked_anim = BakedAnimation(rainbow_anim, t_steps=256, n_steps=np_split.n)
+    rainbow_renderer = BakedFrameRenderer(np_split, baked_anim)
     return rainbow_renderer
 
 
@@ -326,7 +678,8 @@ def make_color_spinner_renderer(np, color):
     np_block1 = NeoPixelBlock(np, 0, n//2)
     np_block2 = NeoPixelBlock(np, n//2, n)
     np_split = NeoPixelReplicate(np_block1, np_block2)
-    renderer = Renderer(np_split, anim)
+    baked_anim = BakedAnimation(anim, t_steps=256, n_steps=np_split.n)
+    renderer = BakedFrameRenderer(np_split, baked_anim)
     return renderer
 
 
@@ -334,9 +687,12 @@ def make_color_flash_renderer(np, color):
     flash_anim = SpeedAdjustedAnimation(AnimationFlash(color), speed=1.5)
     np_block1 = NeoPixelBlock(np, 0, n//2)
     np_block2 = NeoPixelBlock(np, n//2, n)
+    # One baked frame per phase, so baking doesn't add any timing jitter. The
+    # shifted copy is baked separately: the sped-up flash doesn't repeat once per
+    # loop, so it can't just be read from the first bake at an offset.
     renderer = Renderers(
-        Renderer(np_block1, flash_anim),
-        Renderer(np_block2, TimeShiftedAnimation(flash_anim, 0.5)),
+        BakedFrameRenderer(np_block1, BakedAnimation(flash_anim, t_steps=256, n_steps=1)),
+        BakedFrameRenderer(np_block2, BakedAnimation(TimeShiftedAnimation(flash_anim, 0.5), t_steps=256, n_steps=1)),
     )
     return renderer
 
@@ -349,74 +705,75 @@ def make_two_color_flash_renderer(np, color1, color2):
         ),
         speed=1.5
     )
-    baked_anim = BakedAnimation(anim, t_steps=200, n_steps=1)
+    baked_anim = BakedAnimation(anim, t_steps=256, n_steps=1)
     np_block1 = NeoPixelBlock(np, 0, n//2)
     np_block2 = NeoPixelBlock(np, n//2, n)
     renderer = Renderers(
-        Renderer(
-            np_block1, 
-            baked_anim
-        ),
-        Renderer(
-            np_block2,
-            ReverseAnimation(baked_anim)
-        ),
+        BakedFrameRenderer(np_block1, baked_anim),
+        BakedFrameRenderer(np_block2, baked_anim, reverse=True),
     )
     return renderer
 
 
-def get_mode():
-    r = pin_r.value() == 0
-    b = pin_b.value() == 0
-    y = pin_y.value() == 0
-    if r and b and y:
-        return "rainbow"
-    elif r and b:
-        return "red_blue_flash"
-    elif r and y:
-        return "red_flash"
-    elif b and y:
-        return "blue_flash"
-    elif r:
-        return "red_spinner"
-    elif b:
-        return "blue_spinner"
-    elif y:
-        return "yellow_spinner"
-    else:
-        return "off"
+# Mode for each combination of switches, indexed by (red << 2) | (blue << 1) | yellow.
+SWITCH_MODES = (
+    "off",
+    "yellow_spinner",
+    "blue_spinner",
+    "blue_flash",
+    "red_spinner",
+    "red_flash",
+    "red_blue_flash",
+    "rainbow",
+)
+
+
+@micropython.native
+def get_mode(r=pin_r, b=pin_b, y=pin_y):
+    return SWITCH_MODES[((r.value() == 0) << 2) | ((b.value() == 0) << 1) | (y.value() == 0)]
+
+
+# Renderer factory for each mode.
+MODE_FACTORIES = {
+    "rainbow": lambda: make_rainbow_renderer(np),
+    "red_blue_flash": lambda: make_two_color_flash_renderer(np, ColorF(1.0, 0.0, 0.0), ColorF(0.0, 0.0, 1.0)),
+    "red_flash": lambda: make_color_flash_renderer(np, ColorF(1.0, 0.0, 0.0)),
+    "blue_flash": lambda: make_color_flash_renderer(np, ColorF(0.0, 0.0, 1.0)),
+    "yellow_flash": lambda: make_color_flash_renderer(np, ColorF(1.0, 0.4, 0.0)),
+    "red_spinner": lambda: make_color_spinner_renderer(np, ColorF(1.0, 0.0, 0.0)),
+    "blue_spinner": lambda: make_color_spinner_renderer(np, ColorF(0.0, 0.0, 1.0)),
+    "yellow_spinner": lambda: make_color_spinner_renderer(np, ColorF(1.0, 0.4, 0.0)),
+    "off": lambda: None,
+}
 
 
 mode = "off"
 renderer = None
+frame = 0
+gc.collect()
 while True:
-    toggle_led()
-    new_mode = get_mode()
-    if new_mode != mode:
-        mode = new_mode
-        print(f"Mode changed to {mode}")
-        if mode == "rainbow":
-            renderer = make_rainbow_renderer(np)
-        elif mode == "red_blue_flash":
-            renderer = make_two_color_flash_renderer(np, ColorF(1.0, 0.0, 0.0), ColorF(0.0, 0.0, 1.0))
-        elif mode == "red_flash":
-            renderer = make_color_flash_renderer(np, ColorF(1.0, 0.0, 0.0))
-        elif mode == "blue_flash":
-            renderer = make_color_flash_renderer(np, ColorF(0.0, 0.0, 1.0))
-        elif mode == "yellow_flash":
-            renderer = make_color_flash_renderer(np, ColorF(1.0, 0.4, 0.0))
-        elif mode == "red_spinner":
-            renderer = make_color_spinner_renderer(np, ColorF(1.0, 0.0, 0.0))
-        elif mode == "blue_spinner":
-            renderer = make_color_spinner_renderer(np, ColorF(0.0, 0.0, 1.0))
-        elif mode == "yellow_spinner":
-            renderer = make_color_spinner_renderer(np, ColorF(1.0, 0.4, 0.0))
-        elif mode == "off":
-            renderer = None
+    # The switches only change at human speed, so while rendering just check them
+    # (and blink the activity LED) every few frames. When off, the loop sleeps
+    # between iterations anyway, so do both every time.
+    idle = renderer is None
+    if idle or frame == 0:
+        toggle_led()
+    if idle or frame & 7 == 0:
+        new_mode = get_mode()
+        if new_mode != mode:
+            mode = new_mode
+            print(f"Mode changed to {mode}")
+            renderer = MODE_FACTORIES[mode]()
+            # Building a renderer allocates (and drops the old one), so collect now,
+            # while a pause doesn't matter, rather than starting the animation with
+            # a heap full of garbage.
+            gc.collect()
+    frame = (frame + 1) & 31
 
     if renderer:
-        renderer.render(timeline.t)
-        np.write()
+        # Skip the (slow) NeoPixel write if the frame hasn't changed.
+        if renderer.render(timeline.t):
+            np.write()
     else:
         np.fill((0, 0, 0))
         np.write()